@@ -1,7 +1,17 @@
 # flask_app.py
-from flask import Flask, render_template_string, request, jsonify
+import os
+# SymPy reads this once at import; the default 1000 entries is small for solve + latex workloads
+os.environ.setdefault('SYMPY_CACHE_SIZE', '10000')
+
+from flask import Flask, request, jsonify
+from flask.json.provider import JSONProvider
+import orjson
 import sympy as sp
-from sympy import Eq, latex, Symbol
+from sympy import Eq, Symbol
+from sympy.polys.polyerrors import BasePolynomialError
+from sympy.solvers.solvers import denoms
+from sympy.printing.latex import LatexPrinter
+from sympy.printing.str import StrPrinter
 from sympy.parsing.sympy_parser import (
     parse_expr, 
     standard_transformations, 
@@ -9,10 +19,44 @@ from sympy.parsing.sympy_parser import (
     convert_xor
 )
 import re
+import gzip
+import hashlib
+import pickle
+import string
+import signal
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+
+try:
+    import symengine as se  # optional C++ backend, used for polynomial expansion
+except ImportError:
+    se = None
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson's C encoder/decoder."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        # orjson already produces bytes, skip the str round-trip of the default implementation
+        return self._app.response_class(orjson.dumps(obj), mimetype='application/json')
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 MAX_INPUT_LENGTH = 500
+SOLVE_TIMEOUT = 4  # seconds
+# Solver processes per server process; gunicorn already runs one server process per core
+SOLVE_WORKERS = int(os.environ.get('SOLVE_WORKERS', 2))
+COMPRESS_MIN_SIZE = 500  # bytes; smaller JSON bodies aren't worth the gzip overhead
 
 SAFE_LOCALS = {
     'sin': sp.sin, 'cos': sp.cos, 'tan': sp.tan,
@@ -23,70 +67,324 @@ SAFE_LOCALS = {
     'Abs': sp.Abs
 }
 
+# parse_expr evaluates the code it generates against these globals. Left to its default it
+# exposes every builtin (breakpoint, print, open, ...), so builtins are replaced by nothing and
+# only SymPy names are provided: what the transformations and evaluate=False emit, plus the
+# elementary functions beyond SAFE_LOCALS. Any other name becomes a Symbol or undefined Function
+PARSE_GLOBALS = {
+    '__builtins__': {},
+    'Symbol': sp.Symbol, 'Function': sp.Function,
+    'Integer': sp.Integer, 'Float': sp.Float, 'Rational': sp.Rational,
+    'Add': sp.Add, 'Mul': sp.Mul, 'Pow': sp.Pow,
+    'factorial': sp.factorial, 'factorial2': sp.factorial2,
+    **{name: getattr(sp, name) for name in (
+        'E', 'sec', 'csc', 'cot', 'asec', 'acsc', 'acot', 'atan2',
+        'sinh', 'cosh', 'tanh', 'coth', 'sech', 'csch', 'asinh', 'acosh', 'atanh', 'acoth', 'asech', 'acsch',
+        'root', 'floor', 'ceiling', 'sign', 're', 'im', 'Min', 'Max',
+    )},
+}
+
+# Symbols for every accepted variable name, built once instead of per request
+_SYMBOL_CACHE = {c: Symbol(c) for c in string.ascii_lowercase}
+
 # Define transformations for implicit multiplication (2x -> 2*x) and carets (x^2 -> x**2)
 TRANSFORMATIONS = (standard_transformations + (implicit_multiplication_application, convert_xor))
 
+# Unicode replacements, applied in a single str.translate pass
+UNICODE_TABLE = str.maketrans({
+    '²':'^2', '³':'^3', '⁴':'^4', '⁵':'^5', '⁶':'^6', '⁷':'^7', '⁸':'^8', '⁹':'^9',
+    '√':'sqrt', '∛':'cbrt', '∞':'oo', 'π':'pi', '×':'*', '·':'*', '÷':'/', '−':'-', '–':'-', '—':'-',
+    '½':'1/2', '¼':'1/4', '¾':'3/4'
+})
+
+# Quotes/semicolons and HTML tags are both dropped, so one scan removes either
+_RE_STRIP = re.compile(r'<[^>]+>|[;\'"`]')
+_RE_ROOT_WORDS = re.compile(r'\b(square|cube)\s+root\s+of\b', re.I)
+_ROOT_FUNCS = {'square': 'sqrt', 'cube': 'cbrt'}
+# Everything the parser can use once Unicode operators are translated; '!' is factorial
+_RE_ALLOWED = re.compile(r'[0-9A-Za-z+\-*/^()., =!\s]*')
+# A run of whitespace separates tokens exactly like a single space does
+_RE_SPACES = re.compile(r'\s+')
+# Builtins are out of reach through PARSE_GLOBALS; attribute access on SymPy objects is not,
+# so refuse dunders (x.__class__...)
+_RE_UNSAFE = re.compile(r'__')
+
+def is_safe_input(text: str):
+    return _RE_UNSAFE.search(text) is None
+
 def sanitize_input(text: str):
+    # Checked before the cache so oversized bodies are never kept as keys
     if not text or len(text) > MAX_INPUT_LENGTH:
         return None, "Input too long (max 500 chars)"
-    text = re.sub(r'[;\'"`]', '', text)
-    text = re.sub(r'<[^>]+>', '', text)
-    # Unicode replacements
-    replacements = {
-        '²':'^2', '³':'^3', '⁴':'^4', '⁵':'^5', '⁶':'^6', '⁷':'^7', '⁸':'^8', '⁹':'^9',
-        '√':'sqrt', '∛':'cbrt', '∞':'oo', 'π':'pi', '×':'*', '·':'*', '÷':'/', '−':'-', '–':'-', '—':'-',
-        '½':'1/2', '¼':'1/4', '¾':'3/4'
-    }
-    for a, b in replacements.items():
-        text = text.replace(a, b)
+    return _sanitize_cached(text)
+
+@lru_cache(maxsize=2048)
+def _sanitize_cached(text: str):
+    text = _RE_STRIP.sub('', text)
+    text = text.translate(UNICODE_TABLE)
     
     # Text replacements
-    text = re.sub(r'\bsquare\s+root\s+of\b', 'sqrt', text, flags=re.I)
-    text = re.sub(r'\bcube\s+root\s+of\b', 'cbrt', text, flags=re.I)
-    
-    # Ensure standard caret usage for convert_xor transformation
-    text = text.replace('**', '^') 
+    text = _RE_ROOT_WORDS.sub(lambda m: _ROOT_FUNCS[m.group(1).lower()], text)
+    text = _RE_SPACES.sub(' ', text)
+    # Cheap lexical checks so garbage never reaches parse_expr
+    if not _RE_ALLOWED.fullmatch(text):
+        return None, "Input contains unsupported characters"
+    if text.count('(') != text.count(')'):
+        return None, "Unbalanced parentheses"
+    if not is_safe_input(text):
+        return None, "Input contains unsupported words"
     return text.strip(), None
 
+@lru_cache(maxsize=1024)
+def _parse_cached(lhs_str: str, rhs_str: str):
+    # SAFE_LOCALS, PARSE_GLOBALS and TRANSFORMATIONS are module constants, so the strings alone are a sound key
+    lhs = parse_expr(lhs_str, local_dict=SAFE_LOCALS, global_dict=PARSE_GLOBALS,
+                     transformations=TRANSFORMATIONS, evaluate=False)
+    rhs = parse_expr(rhs_str, local_dict=SAFE_LOCALS, global_dict=PARSE_GLOBALS,
+                     transformations=TRANSFORMATIONS, evaluate=False)
+    return lhs, rhs
+
 def safe_parse(equation_str: str):
     cleaned, err = sanitize_input(equation_str)
     if err: return None, err
-    
-    # Split into LHS and RHS
-    if '=' in cleaned:
-        lhs_str, rhs_str = cleaned.split('=', 1)
-    else:
-        lhs_str, rhs_str = cleaned, '0'
-        
-    lhs_str = lhs_str.strip()
-    rhs_str = rhs_str.strip()
+    return parse_cleaned(cleaned)
+
+def parse_cleaned(cleaned: str):
+    # Split into LHS and RHS at the first '=' (one scan, fixed 3-tuple)
+    lhs_str, sep, rhs_str = cleaned.partition('=')
+    if not sep:
+        rhs_str = '0'
+    elif '=' in rhs_str:
+        return None, "Use a single '=' per equation"
+    lhs_str, rhs_str = lhs_str.strip(), rhs_str.strip()
 
     try:
         # Use parse_expr with transformations instead of manual regex + sympify
-        lhs = parse_expr(lhs_str, local_dict=SAFE_LOCALS, transformations=TRANSFORMATIONS, evaluate=False)
-        rhs = parse_expr(rhs_str, local_dict=SAFE_LOCALS, transformations=TRANSFORMATIONS, evaluate=False)
-        return Eq(lhs, rhs), None
+        lhs, rhs = _parse_cached(lhs_str, rhs_str)
+        if not (isinstance(lhs, sp.Expr) and isinstance(rhs, sp.Expr)):
+            # Tuples ("x, y = 1"), booleans and the like can't be rearranged into lhs - rhs
+            return None, "Cannot understand: each side must be a single expression"
+        return Eq(lhs, rhs, evaluate=False), None
     except Exception as e:
         return None, f"Cannot understand: {e}"
 
+def _poly_size(expr, var):
+    """Upper bounds (degree in var, bits per coefficient) of expr expanded, or None if unknown.
+
+    Walks the unevaluated tree only, so x^3000000 or 10^10^8 is caught before anything computes it.
+    """
+    if expr == var:
+        return 1, 1
+    if expr.is_Rational:
+        return 0, max(abs(expr.p), expr.q).bit_length()
+    if expr.is_Atom:
+        return 0, 64  # Floats, pi, I, other symbols
+    if expr.is_Add or expr.is_Mul:
+        sizes = [_poly_size(arg, var) for arg in expr.args]
+        if None in sizes:
+            return None
+        degrees, bits = zip(*sizes)
+        return (max(degrees) if expr.is_Add else sum(degrees)), sum(bits)
+    if expr.is_Pow and expr.exp.is_Rational:
+        base = _poly_size(expr.base, var)
+        if base is None:
+            return None
+        n = max(abs(expr.exp.p), expr.exp.q)
+        return base[0] * n, base[1] * n
+    return None  # Functions, symbolic exponents
+
+def poly_roots(eq, var):
+    """Roots of a univariate polynomial equation in var, or None to defer to sp.solve."""
+    diff = eq.lhs - eq.rhs
+    if denoms(diff, var):
+        return None  # Poly cancels x^2/x to x, losing the excluded x = 0; solve checks denominators
+    # Expanding and building the Poly run in this process with no time limit, so only
+    # take inputs whose degree and coefficients stay small; the rest go to the solver
+    size = _poly_size(diff, var)
+    if size is None or size[0] > 6 or size[1] > 4096:
+        return None
+    expanded = None
+    if se is not None:
+        try:
+            # SymEngine expands products and powers far faster, so Poly can skip its own expansion
+            expanded = se.expand(se.sympify(diff))._sympy_()
+        except Exception:
+            pass  # Something SymEngine can't represent, let SymPy expand it
+    try:
+        if expanded is not None:
+            poly = sp.Poly(expanded, var, expand=False)
+        else:
+            poly = sp.Poly(diff, var)
+    except BasePolynomialError:
+        return None  # Not a polynomial in var (sin(x), 1/x, 2^x, ...)
+    # Only exact rational coefficients: floats lose repeated roots in roots(), and symbolic
+    # ones (parameters, pi, oo) need solve's denominator checks and simplification.
+    # Degree 7+ rarely has radical roots.
+    degree = poly.degree()
+    if not (poly.domain.is_ZZ or poly.domain.is_QQ) or not 1 <= degree <= 6:
+        return None
+    if degree <= 2:
+        # For rational coefficients the closed forms give exactly what roots() does, minus its factoring
+        coeffs = poly.all_coeffs()
+        if degree == 1:
+            a, b = coeffs
+            roots = {-b / a}
+        else:
+            a, b, c = coeffs
+            disc = sp.sqrt(b*b - 4*a*c)
+            roots = {(-b - disc) / (2*a), (-b + disc) / (2*a)}
+        return sorted(roots, key=sp.default_sort_key)
+    try:
+        roots = sp.roots(poly, cubics=True, quartics=True)
+    except BasePolynomialError:
+        return None
+    if sum(roots.values()) != degree:
+        return None  # Not all roots expressible in radicals, let solve produce CRootOf
+    # Same order sp.solve returns
+    return sorted(roots, key=sp.default_sort_key)
+
+def _solve_worker(payload):
+    # Unpickling rebuilds expressions through their constructors, which would evaluate x^2/x
+    # to x and lose the excluded x = 0; keep the tree exactly as parsed
+    with sp.evaluate(False):
+        eq, var = pickle.loads(payload)
+    return sp.solve(eq, var)
+
+# Forking a threaded server copies whatever locks other threads hold, so solver processes
+# come from a single-threaded forkserver (spawn where that doesn't exist) with SymPy preloaded
+if 'forkserver' in multiprocessing.get_all_start_methods():
+    _MP_CONTEXT = multiprocessing.get_context('forkserver')
+    _MP_CONTEXT.set_forkserver_preload([__name__])
+else:
+    _MP_CONTEXT = multiprocessing.get_context('spawn')
+
+_KILL_SIGNAL = getattr(signal, 'SIGKILL', signal.SIGTERM)
+
+class _SolveSlot:
+    """One solver process behind its own executor, so it can be killed without touching other solves."""
+
+    def __init__(self):
+        self.pid = None
+        self.executor = ProcessPoolExecutor(max_workers=1, mp_context=_MP_CONTEXT)
+        try:
+            # Starting the process here keeps its start-up out of the solve's time budget
+            self.pid = self.executor.submit(os.getpid).result()
+        except BaseException:
+            self.kill()  # Don't leave a half-started executor behind
+            raise
+
+    def kill(self):
+        if self.pid is not None:
+            try:
+                os.kill(self.pid, _KILL_SIGNAL)
+            except OSError:
+                pass  # Already gone
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    @classmethod
+    def take(cls):
+        """An idle slot, or a new one if every started slot is busy."""
+        try:
+            return _IDLE_SLOTS.pop()
+        except IndexError:
+            return cls()
+
+# sp.solve holds the GIL for its whole run, so it gets its own processes. They are started
+# on first use, so a server that forks after import (gunicorn preload_app) gives every
+# worker its own. A thread holding one of the SOLVE_WORKERS permits always finds an idle
+# slot, so SOLVE_TIMEOUT counts solving time only, never time spent queued
+_SOLVE_PERMITS = threading.BoundedSemaphore(SOLVE_WORKERS)
+_IDLE_SLOTS = []
+
 def safe_solve(eq, var):
+    roots = poly_roots(eq, var)
+    if roots is not None:
+        return roots
+    payload = pickle.dumps((eq, var))
+    with _SOLVE_PERMITS:
+        # A slot whose process died (OOM killer, segfault) refuses all further work; replace it once
+        for retry in (True, False):
+            slot = None
+            try:
+                slot = _SolveSlot.take()
+                result = slot.executor.submit(_solve_worker, payload).result(timeout=SOLVE_TIMEOUT)
+            except BrokenProcessPool:
+                if slot is not None:
+                    slot.kill()
+                if not retry:
+                    raise
+                continue
+            except FutureTimeout:
+                # cancel() can't stop a running solve; kill it so the process doesn't stay busy
+                slot.kill()
+                # Not the same as 'no solutions'; let the caller report it
+                raise TimeoutError(f'no result within {SOLVE_TIMEOUT} seconds') from None
+            except Exception:
+                if slot is None:
+                    raise  # Couldn't start one; _SolveSlot already shut it down
+                _IDLE_SLOTS.append(slot)  # sp.solve raised, the process itself is fine
+                raise
+            _IDLE_SLOTS.append(slot)
+            return result
+
+# Printers carry state while printing (_print_level, _context), so each thread reuses its own pair
+_PRINTERS = threading.local()
+
+def _printers():
+    if not hasattr(_PRINTERS, 'latex'):
+        _PRINTERS.latex = LatexPrinter()
+        _PRINTERS.str = StrPrinter()
+    return _PRINTERS
+
+# SymPy expressions are immutable and hashable, so their printed forms can be memoized
+@lru_cache(maxsize=2048)
+def _latex_cached(expr):
+    return _printers().latex.doprint(expr)
+
+@lru_cache(maxsize=2048)
+def _str_cached(expr):
+    return _printers().str.doprint(expr)
+
+def format_decimal(num):
+    decimal = f"{float(num):.10f}".rstrip('0').rstrip('.')
+    return decimal or '0' # Handle exact 0 case
+
+@lru_cache(maxsize=2048)
+def _decimal_cached(val):
     try:
-        # v1.12+ supports timeout, older versions ignore it
-        return sp.solve(eq, var, timeout=4)
-    except TypeError:
-        return sp.solve(eq, var)
+        if not val.is_number:
+            # Free parameters remain (e.g. sqrt(a)), there is no decimal value to compute
+            return "Symbolic"
+        if val.is_Rational:
+            # Integers and fractions convert to float exactly, no mpmath round-trip needed
+            return format_decimal(val)
+        num = val.evalf(12)
+        return format_decimal(num) if num.is_real else str(num)
     except Exception:
-        return []
+        return "Symbolic"
 
-def solve_equation(equation_str: str, variable_str: str = 'x'):
+@lru_cache(maxsize=512)
+def _solve_cached(cleaned: str, variable_str: str):
     try:
-        variable_str = variable_str.strip().lower()
-        if not re.fullmatch(r'[a-z]', variable_str):
-            return {'error': 'Variable must be a single letter (a-z)'}
-        var = Symbol(variable_str)
-        
-        eq, err = safe_parse(equation_str)
+        var = _SYMBOL_CACHE[variable_str]  # solve_equation only passes accepted names
+        eq, err = parse_cleaned(cleaned)
         if err: return {'error': err}
+
+        # Constant difference (5=5, x=x, x+1=x): decide it here instead of calling the solver.
+        # Decided on the plain subtraction, without .doit(): x/x = 1 keeps x in it and goes to
+        # the solver, which excludes x = 0. is_zero may evalf the constant or build its minimal
+        # polynomial, so only ask it of ones _poly_size can bound (not 10^10^8 or sin(10^10^8))
+        diff = None
+        if isinstance(eq, sp.Equality):
+            # "0x" stays an unevaluated 0*x; drop those terms so 0x = 0 is still an identity
+            diff = sp.Add(*[t for t in sp.Add.make_args(eq.lhs - eq.rhs) if not (t.is_Mul and 0 in t.args)])
+        if diff is not None and var not in diff.free_symbols:
+            zero = True if diff == 0 else diff.is_zero if _poly_size(diff, var) else None
+            if zero:
+                return {'identity': True, 'message': 'True for every value', 'equation': _latex_cached(eq),
+                        'variable': variable_str}
+            if zero is False:
+                return {'no_solution': True, 'message': 'No solutions found', 'equation': _latex_cached(eq)}
         
         if var not in eq.free_symbols:
             avail = ', '.join(str(s) for s in eq.free_symbols)
@@ -98,7 +396,7 @@ def solve_equation(equation_str: str, variable_str: str = 'x'):
         
         # Check if solutions is empty or None
         if not solutions and solutions != 0: 
-             return {'no_solution': True, 'message': 'No solutions found', 'equation': latex(eq)}
+             return {'no_solution': True, 'message': 'No solutions found', 'equation': _latex_cached(eq)}
 
         results = []
         # Ensure solutions is iterable (handle single scalar result edge cases)
@@ -109,31 +407,71 @@ def solve_equation(equation_str: str, variable_str: str = 'x'):
             # Handle dictionary results (common in systems of equations, though we target single var)
             val = sol[var] if isinstance(sol, dict) else sol
             
-            exact = latex(val)
-            plain = str(val)
-            try:
-                num = val.evalf(12)
-                if num.is_real:
-                    decimal = f"{float(num):.10f}".rstrip('0').rstrip('.')
-                    if decimal == '': decimal = '0' # Handle exact 0 case
-                    elif decimal.replace('.','').isdigit() and '.' in decimal: # Ensure X.0 format for integers
-                         if float(decimal).is_integer(): decimal = f"{int(float(decimal))}.0"
-                else:
-                    decimal = str(num)
-            except:
-                decimal = "Symbolic"
+            if val.is_Integer:
+                # LaTeX, plain and decimal forms of an integer are all just its digits
+                exact = plain = decimal = str(val)
+            else:
+                exact = _latex_cached(val)
+                plain = _str_cached(val)
+                decimal = _decimal_cached(val)
             results.append({'exact': exact, 'decimal': decimal, 'plain': plain})
             
         return {
             'success': True,
-            'equation': latex(eq),
+            'equation': _latex_cached(eq),
             'variable': variable_str,
             'solutions': results,
             'count': len(results)
         }
+    except (TimeoutError, BrokenProcessPool):
+        raise  # Says nothing about the equation itself, so keep it out of the cache
     except Exception as e:
         return {'error': f'Solving failed: {str(e)}'}
 
+# Solves currently running, keyed like _solve_cached; identical concurrent requests
+# wait on the first one's Future instead of each starting their own sp.solve
+_INFLIGHT = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+def solve_equation(equation_str: str, variable_str: str = 'x'):
+    # Key the solve cache on the normalized text so spelling variants share one entry
+    cleaned, err = sanitize_input(equation_str)
+    if err: return {'error': err}
+    variable_str = variable_str.strip().lower()
+    # Validated before it becomes a cache key, so arbitrary strings are never memoized
+    if variable_str not in _SYMBOL_CACHE:
+        return {'error': 'Variable must be a single letter (a-z)'}
+    key = (cleaned, variable_str)
+    with _INFLIGHT_LOCK:
+        future = _INFLIGHT.get(key)
+        owner = future is None
+        if owner:
+            future = _INFLIGHT[key] = Future()
+    if owner:
+        try:
+            future.set_result(_solve_cached(*key))
+        except BaseException as e:
+            # Waiters block on this Future, so it must settle even on KeyboardInterrupt/SystemExit
+            future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            with _INFLIGHT_LOCK:
+                del _INFLIGHT[key]
+    try:
+        # Cached results are shared between requests, hand out a copy
+        return dict(future.result())
+    except TimeoutError:
+        return {'error': 'Equation too complex to solve within time limit.'}
+    except BrokenProcessPool:
+        return {'error': 'Solver is restarting, please try again.'}
+
+def clear_caches():
+    """Drop every memoized parse, solve and print result, including SymPy's own cache."""
+    for cached in (_sanitize_cached, _parse_cached, _solve_cached, _latex_cached, _str_cached, _decimal_cached):
+        cached.cache_clear()
+    sp.core.cache.clear_cache()
+
 # ------------------- HTML + JS -------------------
 HTML_TEMPLATE = r'''<!DOCTYPE html>
 <html><head><meta charset="UTF-8"><meta name="viewport" content="width=device-width,initial-scale=1">
@@ -271,6 +609,9 @@ async function solve() {
     } else if (d.no_solution) {
       results.innerHTML = `<div style="text-align:center;padding:30px;background:#fff8e1;border-radius:12px">$${d.equation}$<h3>No solutions</h3></div>`;
       MathJax.typesetPromise();
+    } else if (d.identity) {
+      results.innerHTML = `<div style="text-align:center;padding:30px;background:#e8f5e9;border-radius:12px">$${d.equation}$<h3>True for every value of <strong>${d.variable}</strong></h3></div>`;
+      MathJax.typesetPromise();
     } else {
       window.solutionsData = d.solutions;
       let h = `<div style="text-align:center;padding:15px;background:#fff8e1;border-radius:12px;margin-bottom:15px">$${d.equation}$</div>
@@ -343,18 +684,59 @@ eq.addEventListener('keypress', e => { if (e.key === 'Enter') solve(); });
 </script>
 </body></html>'''
 
+# The page has no template placeholders, so encode it once instead of rendering per request.
+# Leading indentation is dropped; line breaks stay, so inline JS and CSS parse as before
+_INDEX_RESPONSE_BODY = re.sub(r'\n[ \t]+', '\n', HTML_TEMPLATE).encode('utf-8')
+_INDEX_GZ = gzip.compress(_INDEX_RESPONSE_BODY, compresslevel=9)
+# Each encoding is a different representation, so it gets its own ETag
+_INDEX_ETAG = hashlib.sha1(_INDEX_RESPONSE_BODY).hexdigest()
+_INDEX_GZ_ETAG = _INDEX_ETAG + '-gzip'
+
 @app.route('/')
 def index():
-    return render_template_string(HTML_TEMPLATE)
+    use_gzip = request.accept_encodings['gzip']
+    etag = _INDEX_GZ_ETAG if use_gzip else _INDEX_ETAG
+    if request.if_none_match.contains_weak(etag):
+        resp = app.response_class(status=304)
+    elif use_gzip:
+        resp = app.response_class(_INDEX_GZ, mimetype='text/html')
+        resp.headers['Content-Encoding'] = 'gzip'
+    else:
+        resp = app.response_class(_INDEX_RESPONSE_BODY, mimetype='text/html')
+    resp.set_etag(etag)
+    resp.headers['Vary'] = 'Accept-Encoding'
+    # The page only changes on deploy, let browsers reuse it without a round trip
+    resp.headers['Cache-Control'] = 'public, max-age=3600, immutable'
+    return resp
+
+@app.after_request
+def compress_json(resp):
+    if resp.mimetype != 'application/json' or 'Content-Encoding' in resp.headers:
+        return resp
+    resp.vary.add('Accept-Encoding')
+    if request.accept_encodings['gzip'] and resp.content_length and resp.content_length >= COMPRESS_MIN_SIZE:
+        resp.set_data(gzip.compress(resp.get_data(), compresslevel=6))
+        resp.headers['Content-Encoding'] = 'gzip'
+    return resp
 
 @app.route('/solve', methods=['POST'])
 def solve():
-    data = request.get_json(silent=True) or {}
-    equation = data.get('equation', '').strip()
-    variable = data.get('variable', 'x').strip()
+    # Parse the body directly; get_json adds MIME negotiation and request-state bookkeeping
+    raw = request.get_data(cache=False)
+    try:
+        data = orjson.loads(raw) if raw else {}
+    except orjson.JSONDecodeError:
+        data = None
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Invalid request body'})
+    equation = data.get('equation', '')
+    variable = data.get('variable', 'x')
+    if not (isinstance(equation, str) and isinstance(variable, str)):
+        return jsonify({'error': 'Invalid request body'})
+    equation, variable = equation.strip(), variable.strip()
     if not equation:
         return jsonify({'error': 'Enter an equation'})
     return jsonify(solve_equation(equation, variable))
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=int(__import__('os').environ.get('PORT', 5000)))
\ No newline at end of file
+    app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 5000)))
\ No newline at end of file
@@ -0,0 +1,13 @@
+# gunicorn_conf.py
+# Usage: gunicorn -c gunicorn_conf.py flask_app:app
+import multiprocessing
+import os
+
+bind = '0.0.0.0:' + os.environ.get('PORT', '5000')
+workers = multiprocessing.cpu_count()
+worker_class = 'gthread'
+threads = 4
+# Import flask_app (and SymPy with it) once in the master; workers fork with it already loaded
+preload_app = True
+# Hold idle connections open so the page load and the /solve posts that follow reuse one socket
+keepalive = 5
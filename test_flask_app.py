@@ -0,0 +1,172 @@
+# test_flask_app.py
+import os
+import threading
+import time
+
+import pytest
+
+import flask_app
+
+
+@pytest.mark.parametrize('equation, expected', [
+    # A digit followed by e must stay apart from a following +/-, or it lexes as a float literal
+    ('2e + 1 = x', '1 + 2*E'),
+    ('2e - 5 = x', '-5 + 2*E'),
+    ('x = 3e + 2', '2 + 3*E'),
+])
+def test_e_next_to_operator_is_eulers_number(equation, expected):
+    result = flask_app.solve_equation(equation)
+    assert [s['plain'] for s in result['solutions']] == [expected]
+
+
+def test_whitespace_variants_share_a_cache_entry():
+    flask_app.clear_caches()
+    flask_app.solve_equation('2x + 5 = 11')
+    flask_app.solve_equation('2x  +\t5 = 11 ')
+    assert flask_app._solve_cached.cache_info().hits == 1
+
+
+@pytest.mark.parametrize('equation', ['x=x', '5=5', '2x+3x=5x', '0x=0', '2*3=6'])
+def test_identities_hold_for_every_value(equation):
+    assert flask_app.solve_equation(equation).get('identity') is True
+
+
+@pytest.mark.parametrize('equation', ['5 = 10^10^8', 'sin(10^10^8) = 1'])
+def test_constant_check_does_not_evaluate_huge_constants(equation):
+    start = time.monotonic()
+    assert 'identity' not in flask_app.solve_equation(equation)
+    assert time.monotonic() - start < 0.5
+
+
+@pytest.mark.parametrize('equation', ['x/x = 1', '(x-1)/(x-1) = 1'])
+def test_cancelled_denominator_is_not_an_identity(equation):
+    assert 'identity' not in flask_app.solve_equation(equation)
+
+
+@pytest.mark.parametrize('equation', ['x^2/x = 0', 'x^3/x = 0'])
+def test_cancelled_denominator_root_is_excluded(equation):
+    assert flask_app.solve_equation(equation).get('no_solution') is True
+
+
+@pytest.mark.parametrize('equation', ['x^3000000 = 2', 'x = 10^10^8'])
+def test_fast_path_leaves_huge_polynomials_to_the_solver(equation):
+    eq, _ = flask_app.safe_parse(equation)
+    start = time.monotonic()
+    assert flask_app.poly_roots(eq, flask_app._SYMBOL_CACHE['x']) is None
+    assert time.monotonic() - start < 0.5
+
+
+def test_tuple_side_is_a_clean_error():
+    result = flask_app.solve_equation('x,y = 1')
+    assert result['error'].startswith('Cannot understand')
+
+
+@pytest.mark.parametrize('body', [
+    [1, 2],
+    {'equation': 5},
+    {'equation': None},
+    {'equation': 'x=1', 'variable': 7},
+])
+def test_solve_rejects_malformed_bodies(body):
+    resp = flask_app.app.test_client().post('/solve', json=body)
+    assert resp.status_code == 200
+    assert resp.get_json() == {'error': 'Invalid request body'}
+
+
+def test_waiters_are_released_when_the_owner_dies(monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def dying_solve(*key):
+        calls.append(key)
+        started.set()
+        release.wait()
+        raise SystemExit
+
+    monkeypatch.setattr(flask_app, '_solve_cached', dying_solve)
+    outcomes = []
+
+    def request():
+        try:
+            flask_app.solve_equation('x = 1')
+        except SystemExit:
+            outcomes.append('SystemExit')
+
+    owner = threading.Thread(target=request, daemon=True)
+    owner.start()
+    started.wait(5)
+    waiter = threading.Thread(target=request, daemon=True)
+    waiter.start()
+    time.sleep(0.1)  # let the waiter find the in-flight Future
+    release.set()
+    owner.join(5)
+    waiter.join(5)
+    assert not waiter.is_alive()
+    assert outcomes == ['SystemExit', 'SystemExit']
+    assert len(calls) == 1  # the waiter got the owner's exception instead of solving again
+    assert not flask_app._INFLIGHT
+
+
+def test_solver_errors_are_not_reported_as_no_solution():
+    result = flask_app.solve_equation('sin(x) + x = 1')
+    assert result['error'].startswith('Solving failed')
+
+
+def test_solver_recovers_from_a_dead_worker():
+    flask_app.clear_caches()
+    assert flask_app.solve_equation('2^x = 32')['solutions'][0]['plain'] == '5'
+    # Exit abruptly inside the worker, as the OOM killer would
+    with pytest.raises(Exception):
+        flask_app._IDLE_SLOTS[-1].executor.submit(os._exit, 1).result(timeout=10)
+    assert flask_app.solve_equation('2^x = 16')['solutions'][0]['plain'] == '4'
+
+
+def test_solver_that_fails_to_start_is_shut_down(monkeypatch):
+    shut_down = []
+
+    class FailingExecutor(flask_app.ProcessPoolExecutor):
+        def submit(self, *args, **kwargs):
+            raise flask_app.BrokenProcessPool('could not start')
+
+        def shutdown(self, *args, **kwargs):
+            shut_down.append(self)
+            super().shutdown(*args, **kwargs)
+
+    monkeypatch.setattr(flask_app, 'ProcessPoolExecutor', FailingExecutor)
+    monkeypatch.setattr(flask_app, '_IDLE_SLOTS', [])
+    flask_app.clear_caches()
+    assert flask_app.solve_equation('2^x = 32')['error'].startswith('Solver is restarting')
+    assert len(shut_down) == 2  # the first attempt and its one retry
+
+
+def test_timed_out_solve_is_killed_and_not_cached(monkeypatch):
+    monkeypatch.setattr(flask_app, 'SOLVE_TIMEOUT', 1)
+    flask_app.clear_caches()
+    hard = 'sin(x) + cos(2x) + tan(3x) = x'
+    # Once per solver process, so a process left running would block everything after it
+    for _ in range(flask_app.SOLVE_WORKERS):
+        assert flask_app.solve_equation(hard)['error'].startswith('Equation too complex')
+    assert flask_app._solve_cached.cache_info().currsize == 0
+    assert flask_app.solve_equation('2^x = 32')['solutions'][0]['plain'] == '5'
+
+
+def test_oversized_input_is_not_cached():
+    flask_app.clear_caches()
+    assert flask_app.sanitize_input('x' * 10**6)[1].startswith('Input too long')
+    assert flask_app._sanitize_cached.cache_info().currsize == 0
+
+
+def test_invalid_variable_is_not_cached():
+    flask_app.clear_caches()
+    result = flask_app.solve_equation('x = 1', 'x' * 10**6)
+    assert result == {'error': 'Variable must be a single letter (a-z)'}
+    assert flask_app._solve_cached.cache_info().currsize == 0
+
+
+@pytest.mark.parametrize('equation', ['breakpoint() = x', 'print(x) = x', 'open(1) = x', 'chr(95) = x'])
+def test_builtins_are_not_reachable_from_input(equation, monkeypatch, capsys):
+    called = []
+    monkeypatch.setattr('builtins.breakpoint', lambda *a, **k: called.append('breakpoint'))
+    flask_app.solve_equation(equation)
+    assert not called
+    assert capsys.readouterr().out == ''